@@ -1,12 +1,19 @@
 """Main entry point for the Mushroom Segmentation application."""
+import glob
 import logging
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import click
+import cv2
+import numpy as np
 
-from .config.settings import Settings
+from .config.settings import Settings, get_settings
 from .core.segmentation import MushroomSegmenter
 from .core.visualization import Visualizer
 from .utils.io_handler import ImageIO, ResultsExporter
@@ -19,8 +26,122 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _collect_image_paths(input_image: str) -> List[Path]:
+    """
+    Resolve an image file, directory or glob pattern to a list of image paths.
+
+    Args:
+        input_image: Image file, directory or glob pattern
+
+    Returns:
+        Sorted list of image paths
+
+    Raises:
+        FileNotFoundError: If no images match the input
+    """
+    path = Path(input_image)
+
+    if path.is_file():
+        return [validate_image_path(path)]
+
+    if path.is_dir():
+        candidates = path.iterdir()
+    else:
+        candidates = map(Path, glob.glob(input_image, recursive=True))
+    paths = sorted(
+        p for p in candidates if p.is_file() and p.suffix.lower() in ImageIO.SUPPORTED_FORMATS
+    )
+
+    if not paths:
+        raise FileNotFoundError(f"No images found: {input_image}")
+
+    return paths
+
+
+def _output_names(paths: List[Path]) -> List[str]:
+    """
+    Derive a distinct output name for each input image.
+
+    Names are the file stems. Images whose stems collide (e.g. ``a.jpg`` and
+    ``a.png``, or equal names in different directories) are named from their
+    path relative to the common directory, including the extension.
+
+    Raises:
+        ValueError: If the images cannot be given distinct names
+    """
+    stems = [p.stem for p in paths]
+    counts = Counter(stem.lower() for stem in stems)
+
+    if any(count > 1 for count in counts.values()):
+        root = Path(os.path.commonpath([p.resolve().parent for p in paths]))
+        for i, path in enumerate(paths):
+            if counts[stems[i].lower()] > 1:
+                relative = path.resolve().relative_to(root).with_suffix("")
+                stems[i] = "_".join(relative.parts) + "_" + path.suffix.lstrip(".")
+
+    if len({stem.lower() for stem in stems}) != len(stems):
+        raise ValueError("Input images cannot be given distinct output names")
+
+    return stems
+
+
+def _rescale_circles(
+    circles: Iterable[Tuple[int, int, int, int]], scale: int
+) -> Iterator[Tuple[int, int, int, int]]:
+    """Map circles found on a downscaled image back to original pixel coordinates."""
+    for x, y, radius1, radius2 in circles:
+        yield x * scale, y * scale, radius1 * scale, radius2 * scale
+
+
+def _segment_and_export(
+    input_path: Path,
+    output_path: Path,
+    settings: Settings,
+    vis_path: Optional[Path] = None,
+    scale: int = 1,
+) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]]]:
+    """
+    Load an image, segment it and export the results (and annotated image).
+
+    The CSV is written in original pixel coordinates; the returned results and
+    the visualization match the (possibly downscaled) returned image.
+    """
+    image = ImageIO.load_image(input_path, scale=scale)
+    results = MushroomSegmenter(settings).segment(image)
+
+    ResultsExporter.to_csv(_rescale_circles(results, scale), output_path)
+    logger.info(f"{input_path.name}: {len(results)} objects, results saved to: {output_path}")
+
+    if vis_path:
+        annotated_image = Visualizer().draw_circles(image, results)
+        ImageIO.save_image(annotated_image, vis_path)
+        logger.info(f"Visualization saved to: {vis_path}")
+
+    return image, results
+
+
+def _process_one(
+    paths: Tuple[Path, Path, Optional[Path]],
+    settings: Settings,
+    scale: int = 1,
+) -> int:
+    """Process a single image in a worker process and return the object count."""
+    input_path, output_path, vis_path = paths
+
+    if vis_path:
+        _, results = _segment_and_export(input_path, output_path, settings, vis_path, scale)
+        return len(results)
+
+    # Without a visualization the circles are streamed straight to the CSV file
+    image = ImageIO.load_image(input_path, scale=scale)
+    circles = MushroomSegmenter(settings).segment_iter(image)
+    count = ResultsExporter.to_csv(_rescale_circles(circles, scale), output_path)
+    logger.info(f"{input_path.name}: {count} objects, results saved to: {output_path}")
+    return count
+
+
 @click.command()
-@click.argument("input_image", type=click.Path(exists=True))
+@click.argument("input_image")
 @click.option(
     "--output-csv", "-o", default="results.csv", help="Output CSV file path", type=click.Path()
 )
@@ -51,6 +172,19 @@ logger = logging.getLogger(__name__)
     help="Relative threshold for peak detection (0-1)",
     type=click.FloatRange(0, 1),
 )
+@click.option(
+    "--scale",
+    default="1",
+    help="Downscale factor applied while decoding; results stay in original pixels",
+    type=click.Choice(["1", "2", "4", "8"]),
+)
+@click.option(
+    "--workers",
+    "-j",
+    default=None,
+    help="Worker processes for batch input (default: CPU count)",
+    type=click.IntRange(1, None),
+)
 def cli(
     input_image: str,
     output_csv: str,
@@ -61,57 +195,76 @@ def cli(
     threshold: int,
     min_diameter: int,
     peaks_threshold: float,
+    scale: str,
+    workers: Optional[int],
 ) -> None:
     """
     Detect and segment circular objects (mushrooms) in images.
 
-    INPUT_IMAGE: Path to the input image file (JPG or PNG)
+    INPUT_IMAGE: Path to an image file (JPG or PNG), a directory or a glob pattern.
+    When several images are given, they are processed in parallel and each result
+    is written next to --output-csv as <image name>_results.csv and no window is shown.
     """
     try:
+        # Let OpenCV use all cores and its optimized code paths
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(os.cpu_count() or 1)
+
         # Load configuration
-        settings = Settings()
         if config:
             settings = Settings(_env_file=config)
+        else:
+            settings = get_settings().model_copy()
 
         # Override with CLI arguments if provided
         settings.back_threshold = back_threshold
         settings.threshold = threshold
-        settings.min_diameter = min_diameter
         settings.peaks_rel_threshold = peaks_threshold
 
+        # Detection runs on the downscaled image, so scale the size limits with it
+        scale_factor = int(scale)
+        settings.min_diameter = max(1, min_diameter // scale_factor)
+        if settings.max_diameter:
+            settings.max_diameter = max(1, settings.max_diameter // scale_factor)
+
         # Validate paths
-        input_path = validate_image_path(input_image)
+        input_paths = _collect_image_paths(input_image)
         output_path = validate_output_path(output_csv)
+        vis_path = Path(save_visualization) if save_visualization else None
 
-        logger.info(f"Processing image: {input_path}")
-
-        # Load image
-        image_io = ImageIO()
-        image = image_io.load_image(input_path)
+        if len(input_paths) == 1:
+            input_path = input_paths[0]
+            logger.info(f"Processing image: {input_path}")
 
-        # Perform segmentation
-        segmenter = MushroomSegmenter(settings)
-        results = segmenter.segment(image)
+            image, results = _segment_and_export(
+                input_path, output_path, settings, vis_path, scale_factor
+            )
 
-        logger.info(f"Detected {len(results)} objects")
-
-        # Export results
-        exporter = ResultsExporter()
-        exporter.to_csv(results, output_path)
-        logger.info(f"Results saved to: {output_path}")
+            if visualize:
+                visualizer = Visualizer()
+                annotated_image = visualizer.draw_circles(image, results)
+                visualizer.display(annotated_image, window_name="Mushroom Segmentation Results")
+        else:
+            logger.info(f"Processing {len(input_paths)} images")
 
-        # Visualization
-        if visualize or save_visualization:
-            visualizer = Visualizer()
-            annotated_image = visualizer.draw_circles(image, results)
+            jobs = []
+            for path, name in zip(input_paths, _output_names(input_paths)):
+                csv_path = output_path.parent / f"{name}_results.csv"
+                image_vis_path = None
+                if vis_path:
+                    image_vis_path = vis_path.parent / f"{name}_annotated{vis_path.suffix}"
+                jobs.append((path, csv_path, image_vis_path))
 
-            if save_visualization:
-                vis_path = Path(save_visualization)
-                image_io.save_image(annotated_image, vis_path)
-                logger.info(f"Visualization saved to: {vis_path}")
+            # Worker processes already occupy the cores, so keep OpenCV single-threaded
+            with ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                initializer=cv2.setNumThreads,
+                initargs=(1,),
+            ) as executor:
+                process = partial(_process_one, settings=settings, scale=scale_factor)
+                counts = list(executor.map(process, jobs))
 
-            if visualize:
-                visualizer.display(annotated_image, window_name="Mushroom Segmentation Results")
+            logger.info(f"Detected {sum(counts)} objects in {len(counts)} images")
 
         logger.info("Processing completed successfully")
 
@@ -1,7 +1,13 @@
 """Settings module for mushroom segmentation application."""
-from pydantic import Field, field_validator
+import logging
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     """Application settings with validation."""
@@ -27,6 +33,21 @@ class Settings(BaseSettings):
         default=0.1, ge=0.0, le=1.0, description="Relative threshold for peak detection"
     )
 
+    backend: Literal["distance", "hough"] = Field(
+        default="distance",
+        description="Detection backend: distance-transform pipeline or cv2.HoughCircles",
+    )
+
+    max_diameter: int = Field(
+        default=120,
+        ge=0,
+        description="Maximum diameter for the Hough backend in pixels (0 means unbounded)",
+    )
+
+    hough_accumulator_threshold: int = Field(
+        default=30, ge=1, description="Accumulator threshold for the Hough backend"
+    )
+
     # Image processing parameters
     gaussian_kernel_size: int = Field(default=5, description="Size of Gaussian blur kernel")
 
@@ -61,3 +82,23 @@ class Settings(BaseSettings):
         if v % 2 == 0:
             return v + 1
         return v
+
+    @model_validator(mode="after")
+    def warn_default_hough_bound(self) -> "Settings":
+        """Warn that the Hough backend misses objects above the default max_diameter."""
+        if self.backend == "hough" and "max_diameter" not in self.model_fields_set:
+            logger.warning(
+                f"Hough backend only detects objects up to max_diameter={self.max_diameter} px; "
+                "set MAX_DIAMETER for larger objects, or 0 for no bound (much slower)"
+            )
+        return self
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Return the default settings, parsing the environment only once.
+
+    The instance is shared; use ``get_settings().model_copy()`` before modifying it.
+    """
+    return Settings()
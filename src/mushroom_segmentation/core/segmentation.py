@@ -1,16 +1,49 @@
 """Advanced segmentation algorithm for mushroom detection."""
 import logging
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
 
 import cv2
 import numpy as np
-from skimage.feature import corner_peaks
 
 from ..config.settings import Settings
 
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is an optional speed-up
+    numba = None
+
 logger = logging.getLogger(__name__)
 
 
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _extract_circles_nb(
+        peaks: np.ndarray,
+        dist_map: np.ndarray,
+        equalized_dist_map: np.ndarray,
+        coeff: float,
+        min_radius: int,
+    ) -> Tuple[np.ndarray, int]:
+        """Compute (x, y, radius1, radius2) rows for peaks with radius1 >= min_radius."""
+        out = np.empty((peaks.shape[0], 4), dtype=np.int32)
+        count = 0
+
+        # Gather, scale, cast and filter in one pass without temporaries
+        for i in range(peaks.shape[0]):
+            y, x = peaks[i, 0], peaks[i, 1]
+            radius1 = np.int32(dist_map[y, x] * coeff)
+            if radius1 >= min_radius:
+                out[count, 0] = x
+                out[count, 1] = y
+                out[count, 2] = radius1
+                out[count, 3] = np.int32(equalized_dist_map[y, x] * coeff)
+                count += 1
+
+        return out, count
+
+
 class MushroomSegmenter:
     """
     Advanced segmentation algorithm for detecting circular objects in images.
@@ -20,6 +53,9 @@ class MushroomSegmenter:
     conditions.
     """
 
+    # Images with at least this many pixels run through OpenCL (T-API) when available
+    UMAT_MIN_PIXELS = 2_000_000
+
     def __init__(self, settings: Settings) -> None:
         """
         Initialize the segmenter with configuration settings.
@@ -32,6 +68,20 @@ class MushroomSegmenter:
             clipLimit=settings.clahe_clip_limit,
             tileGridSize=(settings.clahe_tile_size, settings.clahe_tile_size),
         )
+        self._open_iters = max(1, settings.min_diameter // 3)
+
+        # Compensation coefficient for the gap between both thresholds
+        self._coeff = 1 + (settings.threshold - settings.back_threshold) / (
+            255 - settings.back_threshold
+        )
+
+        # N passes with a k x k rectangle equal one pass with a (N*(k-1)+1) square,
+        # so the opening and the 5 extra dilations collapse into one erode + one dilate
+        step = settings.morphology_kernel_size - 1
+        erode_size = self._open_iters * step + 1
+        dilate_size = (self._open_iters + 5) * step + 1
+        self._erode_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (erode_size, erode_size))
+        self._dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (dilate_size, dilate_size))
 
     def segment(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """
@@ -43,45 +93,116 @@ class MushroomSegmenter:
         Returns:
             List of detected circles as (x, y, radius1, radius2) tuples
         """
+        circles = list(self.segment_iter(image))
+
+        logger.info(f"Segmentation complete. Found {len(circles)} objects")
+        return circles
+
+    def segment_iter(
+        self, image: np.ndarray, chunk_size: int = 1024
+    ) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Perform segmentation on the input image, yielding circles as they are extracted.
+
+        Peaks are turned into circles in chunks, so consumers such as
+        ResultsExporter.to_csv can write results while the rest are computed.
+
+        Args:
+            image: Input image as numpy array (BGR format)
+            chunk_size: Number of peaks processed per chunk
+
+        Yields:
+            Detected circles as (x, y, radius1, radius2) tuples
+        """
         logger.debug("Starting segmentation process")
 
+        if self.settings.backend == "hough":
+            yield from self._hough_circles(self._preprocess_image(image))
+            return
+
+        # Run the full-image stages on the OpenCL device for large images
+        use_umat = cv2.ocl.useOpenCL() and image.shape[0] * image.shape[1] >= self.UMAT_MIN_PIXELS
+        if use_umat:
+            image = cv2.UMat(image)
+
         # Preprocessing
         preprocessed = self._preprocess_image(image)
 
         # Background removal
         foreground_mask = self._remove_background(preprocessed)
 
-        # Apply mask to preprocessed image
-        masked_image = cv2.bitwise_and(preprocessed, preprocessed, mask=foreground_mask)
-
-        # Distance transform
-        dist_map = self._compute_distance_transform(masked_image)
+        # Apply mask to preprocessed image (the mask is 0/255, so a plain AND suffices)
+        masked_image = cv2.bitwise_and(preprocessed, foreground_mask)
+
+        # Distance transforms of the masked image and of its equalized version.
+        # Both branches are independent and OpenCV releases the GIL, so they overlap
+        # on a second thread unless OpenCV is limited to one (e.g. in batch workers).
+        if cv2.getNumThreads() > 1 and not use_umat:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                equalized = executor.submit(self._equalized_distance_transform, masked_image)
+                dist_map = self._distance_transform_gray(masked_image)
+                equalized_dist_map = equalized.result()
+        else:
+            dist_map = self._distance_transform_gray(masked_image)
+            equalized_dist_map = self._equalized_distance_transform(masked_image)
 
-        # Histogram equalization for better peak detection
-        equalized_image = self._clahe.apply(masked_image)
-        equalized_dist_map = self._compute_distance_transform(equalized_image)
+        if use_umat:
+            dist_map = dist_map.get()
+            equalized_dist_map = equalized_dist_map.get()
 
         # Find local maxima
         peaks = self._find_local_maxima(equalized_dist_map)
 
         # Extract circles
-        circles = self._extract_circles(peaks, dist_map, equalized_dist_map)
+        for start in range(0, len(peaks), chunk_size):
+            chunk = peaks[start : start + chunk_size]
+            yield from self._extract_circles(chunk, dist_map, equalized_dist_map)
 
-        logger.info(f"Segmentation complete. Found {len(circles)} objects")
-        return circles
+    def _hough_circles(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Detect circles in a single pass with cv2.HoughCircles.
+
+        Faster than the distance-transform pipeline on small or sparse images.
+        Both radii of each circle are the Hough radius.
+
+        Args:
+            image: Preprocessed grayscale image
+
+        Returns:
+            List of detected circles as (x, y, radius, radius) tuples
+        """
+        # HoughCircles rejects a zero Canny threshold and treats maxRadius 0 as unbounded
+        max_diameter = self.settings.max_diameter
+        found = cv2.HoughCircles(
+            image,
+            cv2.HOUGH_GRADIENT,
+            dp=1,
+            minDist=self.settings.min_diameter,
+            param1=max(1, self.settings.threshold),
+            param2=self.settings.hough_accumulator_threshold,
+            minRadius=self.settings.min_diameter // 2,
+            maxRadius=max(1, max_diameter // 2) if max_diameter else 0,
+        )
+
+        if found is None:
+            return []
+
+        circles = np.around(found[0]).astype(np.int32)
+        xs, ys, radii = circles[:, 0].tolist(), circles[:, 1].tolist(), circles[:, 2].tolist()
+        return list(zip(xs, ys, radii, radii))
 
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Apply preprocessing steps to the image."""
+        # Convert to grayscale first, so the blur processes one channel instead of three
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
         # Apply Gaussian blur
         blurred = cv2.GaussianBlur(
-            image, (self.settings.gaussian_kernel_size, self.settings.gaussian_kernel_size), 0
+            gray, (self.settings.gaussian_kernel_size, self.settings.gaussian_kernel_size), 0
         )
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(blurred, cv2.COLOR_BGR2GRAY)
-
         # Apply CLAHE for normalization
-        normalized = self._clahe.apply(gray)
+        normalized = self._clahe.apply(blurred)
 
         return normalized
 
@@ -90,42 +211,82 @@ class MushroomSegmenter:
         # Threshold
         _, binary = cv2.threshold(image, self.settings.back_threshold, 255, cv2.THRESH_BINARY)
 
-        # Morphological operations
-        kernel = np.ones(
-            (self.settings.morphology_kernel_size, self.settings.morphology_kernel_size), np.uint8
-        )
-
-        # Opening to remove small objects
-        iterations = max(1, self.settings.min_diameter // 3)
-        opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=iterations)
+        # Erosion of the opening, removes small objects
+        eroded = cv2.erode(binary, self._erode_kernel)
 
-        # Dilation to connect nearby regions
-        dilated = cv2.dilate(opened, kernel, iterations=5)
+        # Dilation of the opening plus extra dilation to connect nearby regions
+        dilated = cv2.dilate(eroded, self._dilate_kernel)
 
         return dilated
 
-    def _compute_distance_transform(self, image: np.ndarray) -> np.ndarray:
-        """Compute distance transform of the binary image."""
-        # Threshold if not already binary
-        if len(np.unique(image)) > 2:
-            _, binary = cv2.threshold(image, self.settings.threshold, 255, cv2.THRESH_BINARY)
-        else:
-            binary = image
+    def _distance_transform_binary(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Compute distance transform of a binary (0/255) mask.
 
-        # Compute distance transform
-        dist = cv2.distanceTransform(binary, cv2.DIST_L2, 3)
+        Uses the 3x3 L2 approximation with float32 output. An 8-bit output is
+        only available for DIST_L1, which would distort the measured radii.
+        """
+        return cv2.distanceTransform(mask, cv2.DIST_L2, cv2.DIST_MASK_3)
+
+    def _distance_transform_gray(self, image: np.ndarray) -> np.ndarray:
+        """Threshold a grayscale image at settings.threshold and compute its distance transform."""
+        _, binary = cv2.threshold(image, self.settings.threshold, 255, cv2.THRESH_BINARY)
+        return self._distance_transform_binary(binary)
 
-        return dist
+    def _equalized_distance_transform(self, image: np.ndarray) -> np.ndarray:
+        """Equalize the image with CLAHE for better peak detection, then transform it."""
+        return self._distance_transform_gray(self._clahe.apply(image))
 
     def _find_local_maxima(self, distance_map: np.ndarray) -> np.ndarray:
         """Find local maxima in the distance map."""
-        peaks = corner_peaks(
-            distance_map,
-            min_distance=self.settings.min_diameter,
-            threshold_rel=self.settings.peaks_rel_threshold,
-            indices=True,
+        # Without any background pixel the transform saturates at FLT_MAX; such
+        # values carry no distance, and a flat map has no peaks at all
+        valid = np.isfinite(distance_map) & (distance_map < np.finfo(np.float32).max)
+        if not valid.all():
+            distance_map = np.where(valid, distance_map, 0).astype(np.float32)
+
+        if distance_map.size == 0 or distance_map.max() == distance_map.min():
+            logger.debug("Found 0 local maxima")
+            return np.empty((0, 2), dtype=np.intp)
+
+        # Only the ordering matters here, so search a uint16 copy scaled to the
+        # full range; it is half the size of the float32 map
+        quantized = cv2.normalize(
+            distance_map, None, alpha=65535, norm_type=cv2.NORM_INF, dtype=cv2.CV_16U
         )
 
+        # A pixel is a peak if it equals the maximum of its neighbourhood
+        size = 2 * self.settings.min_diameter + 1
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (size, size))
+        dilated = cv2.dilate(quantized, kernel)
+
+        threshold = quantized.max() * self.settings.peaks_rel_threshold
+        mask = (quantized == dilated) & (quantized > threshold)
+
+        # Ignore peaks closer than min_diameter to the image border
+        border = self.settings.min_diameter
+        mask[:border] = False
+        mask[-border:] = False
+        mask[:, :border] = False
+        mask[:, -border:] = False
+
+        # Ties inside one window all survive the comparison, so keep peaks at least
+        # min_diameter apart (Chebyshev), strongest first and then in raster order,
+        # as corner_peaks did
+        candidates = np.flatnonzero(mask)
+        candidates = candidates[np.argsort(-distance_map.ravel()[candidates], kind="stable")]
+
+        taken = np.zeros(mask.shape, dtype=bool)
+        kept = []
+        for y, x in zip(*np.unravel_index(candidates, mask.shape)):
+            if not taken[y, x]:
+                kept.append((y, x))
+                y0, x0 = max(0, y - border), max(0, x - border)
+                taken[y0 : y + border + 1, x0 : x + border + 1] = True
+
+        # Report the kept peaks in raster order
+        peaks = np.array(sorted(kept), dtype=np.intp).reshape(-1, 2)
+
         logger.debug(f"Found {len(peaks)} local maxima")
         return peaks
 
@@ -133,22 +294,20 @@ class MushroomSegmenter:
         self, peaks: np.ndarray, dist_map: np.ndarray, equalized_dist_map: np.ndarray
     ) -> List[Tuple[int, int, int, int]]:
         """Extract circle parameters from peak locations."""
-        circles = []
-
-        # Calculate compensation coefficient
-        coeff = 1 + (self.settings.threshold - self.settings.back_threshold) / (
-            255 - self.settings.back_threshold
+        if numba is not None:
+            out, count = _extract_circles_nb(
+                peaks, dist_map, equalized_dist_map, self._coeff, self.settings.min_diameter // 2
+            )
+            return list(zip(*out[:count].T.tolist()))
+
+        # Get radii from both distance maps
+        ys, xs = peaks[:, 0], peaks[:, 1]
+        radii1 = (dist_map[ys, xs] * self._coeff).astype(np.int32)
+        radii2 = (equalized_dist_map[ys, xs] * self._coeff).astype(np.int32)
+
+        # Filter by minimum diameter
+        keep = radii1 >= self.settings.min_diameter // 2
+
+        return list(
+            zip(xs[keep].tolist(), ys[keep].tolist(), radii1[keep].tolist(), radii2[keep].tolist())
         )
-
-        for peak in peaks:
-            y, x = peak
-
-            # Get radii from both distance maps
-            radius1 = int(dist_map[y, x] * coeff)
-            radius2 = int(equalized_dist_map[y, x] * coeff)
-
-            # Filter by minimum diameter
-            if radius1 >= self.settings.min_diameter // 2:
-                circles.append((x, y, radius1, radius2))
-
-        return circles
@@ -5,7 +5,7 @@ from typing import List, Optional, Tuple
 import cv2
 import numpy as np
 
-from ..config.settings import Settings
+from ..config.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,11 @@ logger = logging.getLogger(__name__)
 class Visualizer:
     """Handle visualization of segmentation results."""
 
+    # From this many circles on, each unique radius is rasterized once and pasted
+    # at all its centers, which beats per-circle cv2.circle calls. Overlaps are then
+    # layered by kind (rings, then centers) instead of circle by circle.
+    GROUPED_DRAW_MIN_CIRCLES = 250
+
     def __init__(self, settings: Optional[Settings] = None) -> None:
         """
         Initialize visualizer with optional settings.
@@ -20,7 +25,8 @@ class Visualizer:
         Args:
             settings: Configuration settings for visualization
         """
-        self.settings = settings or Settings()
+        # Copy the shared defaults so that changing colors here stays local
+        self.settings = settings or get_settings().model_copy()
 
     def draw_circles(
         self, image: np.ndarray, circles: List[Tuple[int, int, int, int]], copy: bool = True
@@ -28,6 +34,11 @@ class Visualizer:
         """
         Draw detected circles on the image.
 
+        With GROUPED_DRAW_MIN_CIRCLES or more circles, all first-radius rings are
+        drawn, then all second-radius rings, then all centers. Where circles overlap,
+        this differs from drawing them one by one: centers always stay visible, and
+        a ring of an earlier circle can cover one of a later circle.
+
         Args:
             image: Input image
             circles: List of circles as (x, y, radius1, radius2) tuples
@@ -39,6 +50,16 @@ class Visualizer:
         if copy:
             image = image.copy()
 
+        if len(circles) >= self.GROUPED_DRAW_MIN_CIRCLES:
+            xs, ys, radii1, radii2 = np.asarray(circles, dtype=np.int64).reshape(-1, 4).T
+            thickness = self.settings.line_thickness
+
+            # Rings first and centers last, so no ring hides a center
+            self._draw_grouped(image, xs, ys, radii1, self.settings.radius1_color, thickness)
+            self._draw_grouped(image, xs, ys, radii2, self.settings.radius2_color, thickness)
+            self._draw_grouped(image, xs, ys, np.full_like(xs, 3), self.settings.center_color, -1)
+            return image
+
         for x, y, radius1, radius2 in circles:
             # Draw center point
             cv2.circle(image, (x, y), 3, self.settings.center_color, -1)
@@ -55,6 +76,34 @@ class Visualizer:
 
         return image
 
+    @staticmethod
+    def _draw_grouped(
+        image: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        radii: np.ndarray,
+        color: Tuple[int, int, int],
+        thickness: int,
+    ) -> None:
+        """Draw circles by rasterizing one stencil per unique radius and pasting it."""
+        height, width = image.shape[:2]
+
+        # Pad or cut the color to the channel count, as cv2.circle does
+        channels = image.shape[2] if image.ndim == 3 else 1
+        fill = (*color, 0)[:channels]
+
+        for radius in np.unique(radii):
+            half = int(radius) + max(thickness, 0)
+            stencil = np.zeros((2 * half + 1, 2 * half + 1), np.uint8)
+            cv2.circle(stencil, (half, half), int(radius), 255, thickness)
+            dy, dx = np.nonzero(stencil)
+
+            selected = radii == radius
+            py = (ys[selected, None] + (dy - half)).ravel()
+            px = (xs[selected, None] + (dx - half)).ravel()
+            inside = (py >= 0) & (py < height) & (px >= 0) & (px < width)
+            image[py[inside], px[inside]] = fill
+
     def create_overlay(
         self, image: np.ndarray, circles: List[Tuple[int, int, int, int]], alpha: float = 0.3
     ) -> np.ndarray:
@@ -69,13 +118,27 @@ class Visualizer:
         Returns:
             Image with overlay
         """
-        overlay = image.copy()
         output = image.copy()
+        height, width = image.shape[:2]
+
+        # Blend each disc only inside its bounding box. Blending always starts from
+        # the original image, so overlapping discs are not blended twice.
+        max_size = 2 * max((radius2 for *_, radius2 in circles), default=0) + 1
+        color = np.empty((min(height, max_size), min(width, max_size)) + image.shape[2:], np.uint8)
+        color[:] = (*self.settings.radius2_color, 0)[: image.shape[2] if image.ndim == 3 else 1]
 
         for x, y, _, radius2 in circles:
-            cv2.circle(overlay, (x, y), radius2, self.settings.radius2_color, -1)
+            x0, y0 = max(0, x - radius2), max(0, y - radius2)
+            x1, y1 = min(width, x + radius2 + 1), min(height, y + radius2 + 1)
+            if x0 >= x1 or y0 >= y1:
+                continue
+
+            source = image[y0:y1, x0:x1]
+            disc = np.zeros(source.shape[:2], np.uint8)
+            cv2.circle(disc, (x - x0, y - y0), radius2, 255, -1)
 
-        cv2.addWeighted(overlay, alpha, output, 1 - alpha, 0, output)
+            blended = cv2.addWeighted(color[: y1 - y0, : x1 - x0], alpha, source, 1 - alpha, 0)
+            cv2.copyTo(blended, disc, output[y0:y1, x0:x1])
 
         # Draw circle borders
         output = self.draw_circles(output, circles, copy=False)
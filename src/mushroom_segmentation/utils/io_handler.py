@@ -2,7 +2,7 @@
 import csv
 import logging
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import Iterable, List, Tuple, Union
 
 import cv2
 import numpy as np
@@ -15,19 +15,30 @@ class ImageIO:
 
     SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif"}
 
+    # JPEGs are downscaled by the decoder itself, other formats after decoding
+    DECODE_FLAGS = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+
     @classmethod
-    def load_image(cls, path: Union[str, Path]) -> np.ndarray:
+    def load_image(cls, path: Union[str, Path], scale: int = 1) -> np.ndarray:
         """
         Load an image from file.
 
         Args:
             path: Path to the image file
+            scale: Downscale factor applied while decoding (1, 2, 4 or 8).
+                Coordinates measured on the result must be multiplied by
+                scale to map back to the original image.
 
         Returns:
             Image as numpy array in BGR format
 
         Raises:
-            ValueError: If image format is not supported
+            ValueError: If image format or scale is not supported
             RuntimeError: If image cannot be loaded
         """
         path = Path(path)
@@ -38,7 +49,18 @@ class ImageIO:
                 f"Supported formats: {', '.join(cls.SUPPORTED_FORMATS)}"
             )
 
-        image = cv2.imread(str(path))
+        if scale not in cls.DECODE_FLAGS:
+            raise ValueError(
+                f"Unsupported scale: {scale}. "
+                f"Supported scales: {', '.join(map(str, cls.DECODE_FLAGS))}"
+            )
+
+        try:
+            data = np.fromfile(path, dtype=np.uint8)
+        except OSError as e:
+            raise RuntimeError(f"Failed to load image: {path}") from e
+
+        image = cv2.imdecode(data, cls.DECODE_FLAGS[scale])
 
         if image is None:
             raise RuntimeError(f"Failed to load image: {path}")
@@ -72,17 +94,25 @@ class ImageIO:
 class ResultsExporter:
     """Export segmentation results in various formats."""
 
+    CSV_HEADER = ["X", "Y", "Radius_1", "Radius_2"]
+
     @staticmethod
     def to_csv(
-        circles: List[Tuple[int, int, int, int]], path: Union[str, Path], header: bool = True
-    ) -> None:
+        circles: Iterable[Tuple[int, int, int, int]], path: Union[str, Path], header: bool = True
+    ) -> int:
         """
         Export circles to CSV file.
 
+        Rows are written as they are consumed, so a generator such as
+        MushroomSegmenter.segment_iter is streamed without building a list.
+
         Args:
-            circles: List of circles as (x, y, radius1, radius2) tuples
+            circles: Iterable of circles as (x, y, radius1, radius2) tuples
             path: Output CSV file path
             header: Whether to include header row
+
+        Returns:
+            Number of circles written
         """
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -91,11 +121,14 @@ class ResultsExporter:
             writer = csv.writer(f)
 
             if header:
-                writer.writerow(["X", "Y", "Radius_1", "Radius_2"])
+                writer.writerow(ResultsExporter.CSV_HEADER)
 
-            writer.writerows(circles)
+            count = 0
+            for count, circle in enumerate(circles, start=1):
+                writer.writerow(circle)
 
-        logger.debug(f"Exported {len(circles)} circles to {path}")
+        logger.debug(f"Exported {count} circles to {path}")
+        return count
 
     @staticmethod
     def to_json(
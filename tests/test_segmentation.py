@@ -0,0 +1,47 @@
+"""Tests for the segmentation algorithm."""
+import numpy as np
+
+from mushroom_segmentation.config.settings import Settings
+from mushroom_segmentation.core.segmentation import MushroomSegmenter
+
+
+def make_segmenter() -> MushroomSegmenter:
+    """Create a segmenter with default settings, ignoring any .env file."""
+    return MushroomSegmenter(Settings(_env_file=None))
+
+
+def test_equal_maxima_close_together_give_one_peak():
+    distance_map = np.zeros((200, 200), dtype=np.float32)
+    distance_map[100, 100] = 10.0
+    distance_map[100, 103] = 10.0
+
+    peaks = make_segmenter()._find_local_maxima(distance_map)
+
+    assert peaks.tolist() == [[100, 100]]
+
+
+def test_stronger_peak_wins_over_earlier_one():
+    distance_map = np.zeros((200, 200), dtype=np.float32)
+    distance_map[100, 100] = 10.0
+    distance_map[102, 100] = 10.5
+
+    peaks = make_segmenter()._find_local_maxima(distance_map)
+
+    assert peaks.tolist() == [[102, 100]]
+
+
+def test_distant_maxima_are_kept():
+    distance_map = np.zeros((200, 200), dtype=np.float32)
+    distance_map[50, 50] = 10.0
+    distance_map[50, 150] = 10.0
+    distance_map[150, 100] = 10.0
+
+    peaks = make_segmenter()._find_local_maxima(distance_map)
+
+    assert peaks.tolist() == [[50, 50], [50, 150], [150, 100]]
+
+
+def test_flat_map_has_no_peaks():
+    peaks = make_segmenter()._find_local_maxima(np.ones((200, 200), dtype=np.float32))
+
+    assert peaks.shape == (0, 2)